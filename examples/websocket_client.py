@@ -15,8 +15,11 @@ Features:
 - Historical preload: Get recent kills when first subscribing
 - Extended preload: Request historical data with progressive delivery
 
-Dependencies:
+Dependencies (Python 3.10+):
     pip install websockets asyncio
+    pip install orjson  # optional, faster JSON encoding/decoding
+    pip install pysimdjson  # optional, lazy parsing of inbound frames
+    pip install uvloop  # optional, faster event loop (not on Windows)
 
 Note: This is a simplified Phoenix Channel client implementation.
 For production use, consider using a full Phoenix Channel client library.
@@ -25,6 +28,7 @@ For production use, consider using a full Phoenix Channel client library.
 import asyncio
 import json
 import logging
+import re
 import signal
 import sys
 import time
@@ -32,6 +36,26 @@ from typing import Optional, Dict, List, Any
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 
+# Prefer orjson for encoding/decoding frames; fall back to the stdlib json module.
+try:
+    import orjson
+
+    def json_dumps(obj: Any) -> str:
+        # Phoenix treats binary frames as its binary protocol, so frames must
+        # be sent as text.
+        return orjson.dumps(obj).decode()
+
+    json_loads = orjson.loads
+except ImportError:
+    json_dumps = json.dumps
+    json_loads = json.loads
+
+# pysimdjson parses inbound frames into lazy proxies over a reusable buffer.
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -39,6 +63,109 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Connection options: compression is disabled so frames skip a zlib inflate
+# on every recv, and the frame size allows for large preload batches.
+CONNECT_OPTIONS = {
+    "compression": None,
+    "max_size": 2**24,
+    "read_limit": 2**20,
+    "write_limit": 2**20,
+}
+
+# Received frames wait in a bounded queue for the dispatcher. When it is full,
+# the reader waits for room (TCP backpressure), except for kill count updates:
+# consecutive ones are coalesced to the latest frame per system and queued as
+# a single batch entry.
+INBOX_MAXSIZE = 1024
+
+# Subscription changes are coalesced into one push per batch. The batch window
+# keeps extending while a burst of calls is still arriving, up to the maximum.
+FLUSH_MIN_DELAY = 0.001
+FLUSH_MAX_DELAY = 0.010
+
+# Merged batches are split into pushes of at most this many systems, so they
+# stay within the server's per-push limit (max_subscribed_systems defaults to
+# 50 in KillmailChannel when it is not configured).
+MAX_SYSTEMS_PER_PUSH = 50
+
+# EVE solar system IDs fall in 30000000-32999999, so subscribed systems are
+# tracked as bits of a single int offset from the base.
+SYSTEM_ID_BASE = 30_000_000
+SYSTEM_ID_LIMIT = SYSTEM_ID_BASE + 3_000_000
+
+
+# Bit positions set in each byte value, for decoding bitmaps a byte at a time
+_BYTE_BITS = [tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)]
+_NONZERO_BYTE = re.compile(rb"[^\x00]")
+
+
+def _system_mask(system_ids) -> int:
+    """Build the subscription bitmap for the given solar system IDs."""
+    offsets = []
+    for system_id in system_ids:
+        if not SYSTEM_ID_BASE <= system_id < SYSTEM_ID_LIMIT:
+            raise ValueError(f"Invalid solar system ID: {system_id}")
+        offsets.append(system_id - SYSTEM_ID_BASE)
+    if not offsets:
+        return 0
+    # Set the bits in a byte buffer and convert once; OR-ing each bit into an
+    # int would copy the whole bitmap for every ID
+    buffer = bytearray((max(offsets) >> 3) + 1)
+    for offset in offsets:
+        buffer[offset >> 3] |= 1 << (offset & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _system_ids(bits: int) -> List[int]:
+    """Decode a subscription bitmap back into sorted solar system IDs."""
+    # One linear pass: the regex skips zero bytes in C, and only set bytes
+    # are expanded in Python
+    data = bits.to_bytes((bits.bit_length() + 7) >> 3, "little")
+    system_ids = []
+    for match in _NONZERO_BYTE.finditer(data):
+        index = match.start()
+        base = SYSTEM_ID_BASE + (index << 3)
+        system_ids.extend([base + bit for bit in _BYTE_BITS[data[index]]])
+    return system_ids
+
+
+class _KillCountBatch(dict):
+    """Latest decoded kill_count_update frame per system, queued in place of the coalesced frames."""
+
+
+def _copy_outcome(source: asyncio.Future, target: asyncio.Future):
+    """Resolve target with the result, error or cancellation of source."""
+    if target.done():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+def _materialize(value: Any) -> Any:
+    """Copy a simdjson proxy into plain Python objects so it can outlive the parser buffer."""
+    if simdjson is not None:
+        if isinstance(value, simdjson.Object):
+            return value.as_dict()
+        if isinstance(value, simdjson.Array):
+            return value.as_list()
+    return value
+
+
+def _frame_head(topic: str, event: str) -> str:
+    """Pre-encode a frame up to its payload, e.g. '{"topic":...,"event":...,"payload":'."""
+    return json_dumps({"topic": topic, "event": event})[:-1] + ',"payload":'
+
+
+# Heartbeats only differ in their ref, so the rest of the frame is encoded once.
+HEARTBEAT_FRAME_HEAD = _frame_head("phoenix", "heartbeat") + '{},"ref":'
+
+# Only the system list varies in subscribe/unsubscribe payloads.
+SYSTEMS_PAYLOAD_PREFIX = '{"systems":'
+
 
 class PhoenixChannel:
     """Simplified Phoenix Channel implementation for Python."""
@@ -52,6 +179,7 @@ class PhoenixChannel:
         self.join_ref = None
         self.push_callbacks = {}
         self.event_handlers = {}
+        self._frame_heads: Dict[str, str] = {}
         
     def _next_ref(self) -> str:
         """Generate next message reference."""
@@ -75,7 +203,7 @@ class PhoenixChannel:
         future = asyncio.Future()
         self.push_callbacks[ref] = future
         
-        await self.socket.send(json.dumps(message))
+        await self.socket.send(json_dumps(message))
         
         # Wait for response
         try:
@@ -90,24 +218,21 @@ class PhoenixChannel:
     
     async def push(self, event: str, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Push a message to the channel."""
+        return await self.push_encoded(event, json_dumps(payload) if payload else "{}")
+    
+    async def push_encoded(self, event: str, *payload_parts: str) -> Dict[str, Any]:
+        """Push a message whose payload is already JSON-encoded, possibly split into parts."""
         if not self.joined:
             raise Exception("Must join channel before pushing messages")
             
         ref = self._next_ref()
-        
-        message = {
-            "topic": self.topic,
-            "event": event,
-            "payload": payload,
-            "ref": ref,
-            "join_ref": self.join_ref
-        }
+        frame = self._encode_frame(event, payload_parts, ref)
         
         # Create a future to wait for the response
         future = asyncio.Future()
         self.push_callbacks[ref] = future
         
-        await self.socket.send(json.dumps(message))
+        await self.socket.send(frame)
         
         # Wait for response
         try:
@@ -116,11 +241,26 @@ class PhoenixChannel:
         except asyncio.TimeoutError:
             raise Exception(f"Timeout waiting for response to {event}")
     
-    def on(self, event: str, callback):
-        """Register an event handler."""
-        if event not in self.event_handlers:
-            self.event_handlers[event] = []
-        self.event_handlers[event].append(callback)
+    def _encode_frame(self, event: str, payload_parts, ref: str) -> str:
+        """Build a push frame from its cached pre-encoded head and encoded payload parts."""
+        head = self._frame_heads.get(event)
+        if head is None:
+            head = self._frame_heads[event] = _frame_head(self.topic, event)
+        # Joined in one step so the frame is the only string allocated; refs
+        # are generated digit strings, so they need no JSON escaping
+        return "".join((head, *payload_parts, ',"ref":"', ref, '","join_ref":"', self.join_ref, '"}'))
+    
+    def on(self, event: str, callback, lazy: bool = False):
+        """Register an event handler.
+
+        Handlers receive the payload as plain dicts/lists they may keep. With
+        lazy=True a handler instead gets the parser's lazy proxy when simdjson
+        is installed; it must not keep the payload, or anything taken from it,
+        after returning, since the parser buffer is reused for the next frame.
+        """
+        # Whether the handler is a coroutine is resolved once here, not per message
+        is_coroutine = asyncio.iscoroutinefunction(callback)
+        self.event_handlers.setdefault(event, []).append((callback, is_coroutine, lazy))
     
     async def handle_message(self, message: Dict[str, Any]):
         """Handle incoming message for this channel."""
@@ -128,21 +268,29 @@ class PhoenixChannel:
         ref = message.get("ref")
         payload = message.get("payload", {})
         
-        # Handle push responses
+        # Handle push responses (materialized, since the caller keeps them)
         if event == "phx_reply" and ref in self.push_callbacks:
             future = self.push_callbacks.pop(ref)
             if not future.done():
-                future.set_result(payload)
+                future.set_result(_materialize(payload))
             return
         
         # Handle broadcast events
-        if event in self.event_handlers:
-            for handler in self.event_handlers[event]:
+        handlers = self.event_handlers.get(event)
+        if handlers:
+            materialized = None
+            for handler, is_coroutine, lazy in handlers:
+                if lazy:
+                    handler_payload = payload
+                else:
+                    if materialized is None:
+                        materialized = _materialize(payload)
+                    handler_payload = materialized
                 try:
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(payload)
+                    if is_coroutine:
+                        await handler(handler_payload)
                     else:
-                        handler(payload)
+                        handler(handler_payload)
                 except Exception as e:
                     logger.error(f"Error in event handler for {event}: {e}")
 
@@ -154,12 +302,48 @@ class WandererKillsClient:
         self.server_url = server_url.replace('http://', 'ws://').replace('https://', 'wss://')
         self.websocket: Optional[websockets.WebSocketServerProtocol] = None
         self.channel: Optional[PhoenixChannel] = None
-        self.subscribed_systems: set[int] = set()
+        self._system_bits = 0
         self.subscribed_characters: set[int] = set()
         self.subscription_id: Optional[str] = None
         self.running = False
         self.heartbeat_task = None
         self.heartbeat_ref = 0
+        self._pending_sub_bits = 0
+        self._pending_unsub_bits = 0
+        self._pending_futures: Dict[str, asyncio.Future] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._parser = simdjson.Parser() if simdjson is not None else None
+        self._inbox: Optional[asyncio.Queue] = None
+        self._listen_task: Optional[asyncio.Task] = None
+        self._dispatch_task: Optional[asyncio.Task] = None
+        self._stop_dispatch_task: Optional[asyncio.Task] = None
+        self._kill_count_batch: Optional[_KillCountBatch] = None
+        self.coalesced_kill_count_updates = 0
+        self._stop_event = asyncio.Event()
+
+    @property
+    def subscribed_systems(self) -> set[int]:
+        """System IDs currently subscribed to, decoded from the subscription bitmap."""
+        return set(_system_ids(self._system_bits))
+    
+    @property
+    def subscribed_system_count(self) -> int:
+        """Number of subscribed systems, without decoding the bitmap."""
+        return self._system_bits.bit_count()
+    
+    def _decode(self, message):
+        """Decode an inbound frame, lazily via simdjson when available."""
+        if self._parser is not None:
+            try:
+                return self._parser.parse(message)
+            except RuntimeError:
+                # A handler kept a proxy from an earlier frame, which pins the
+                # old parser buffer; continue on a fresh parser.
+                logger.warning("simdjson parser still in use, starting a new one")
+                self._parser = simdjson.Parser()
+                return self._parser.parse(message)
+        return json_loads(message)
         
     async def connect(self, systems: List[int] = None, character_ids: List[int] = None, 
                      preload: Dict[str, Any] = None) -> Dict[str, Any]:
@@ -177,11 +361,14 @@ class WandererKillsClient:
             uri = f"{self.server_url}/socket/websocket?vsn=2.0.0&client_identifier={client_id}"
             logger.info(f"Connecting to {uri}")
             
-            self.websocket = await websockets.connect(uri)
+            self.websocket = await websockets.connect(uri, **CONNECT_OPTIONS)
             self.running = True
+            self._stop_event.clear()
             
-            # Start message listener
-            asyncio.create_task(self._listen_for_messages())
+            # Start message listener, which hands raw frames to the dispatcher
+            self._inbox = asyncio.Queue(maxsize=INBOX_MAXSIZE)
+            self._listen_task = asyncio.create_task(self._listen_for_messages())
+            self._dispatch_task = asyncio.create_task(self._dispatch_messages())
             
             # Start heartbeat
             self.heartbeat_task = asyncio.create_task(self._heartbeat())
@@ -190,7 +377,7 @@ class WandererKillsClient:
             channel_params = {}
             if systems:
                 channel_params["systems"] = systems
-                self.subscribed_systems.update(systems)
+                self._system_bits |= _system_mask(systems)
             if character_ids:
                 channel_params["character_ids"] = character_ids
                 self.subscribed_characters.update(character_ids)
@@ -218,12 +405,17 @@ class WandererKillsClient:
             raise
     
     def _setup_event_handlers(self):
-        """Set up event handlers for the channel."""
+        """Set up event handlers for the channel.
+
+        The killmail and kill count handlers only log scalar fields, so they
+        read the lazy payload proxies directly. The preload handlers format
+        whole subtrees (such as the error entries), so they get plain objects.
+        """
         # Killmail updates
-        self.channel.on("killmail_update", self._handle_killmail_update)
+        self.channel.on("killmail_update", self._handle_killmail_update, lazy=True)
         
         # Kill count updates
-        self.channel.on("kill_count_update", self._handle_kill_count_update)
+        self.channel.on("kill_count_update", self._handle_kill_count_update, lazy=True)
         
         # Extended preload events
         self.channel.on("preload_status", self._handle_preload_status)
@@ -232,15 +424,24 @@ class WandererKillsClient:
     
     def _handle_killmail_update(self, payload: Dict[str, Any]):
         """Handle killmail update events."""
+        # The payload is only read for logging, so leave it untouched when
+        # INFO records would be dropped anyway
+        if logger.isEnabledFor(logging.INFO):
+            self._log_killmails(payload)
+    
+    def _log_killmails(self, payload: Dict[str, Any]):
+        """Log a summary of a killmail update and its first few killmails."""
         system_id = payload.get("system_id")
         killmails = payload.get("killmails", [])
         timestamp = payload.get("timestamp")
         is_preload = payload.get("preload", False)
         
-        logger.info(f"🔥 New killmails in system {system_id}:")
-        logger.info(f"   Killmails: {len(killmails)}")
-        logger.info(f"   Timestamp: {timestamp}")
-        logger.info(f"   Preload: {'Yes (historical data)' if is_preload else 'No (real-time)'}")
+        # Built as one record: a single handler lock, timestamp and write
+        lines = [
+            f"   Killmails: {len(killmails)}",
+            f"   Timestamp: {timestamp}",
+            f"   Preload: {'Yes (historical data)' if is_preload else 'No (real-time)'}",
+        ]
         
         for i, killmail in enumerate(killmails[:3], 1):  # Show first 3
             killmail_id = killmail.get("killmail_id")
@@ -248,31 +449,35 @@ class WandererKillsClient:
             attackers = killmail.get("attackers", [])
             zkb = killmail.get("zkb", {})
             
-            logger.info(f"   [{i}] Killmail ID: {killmail_id}")
+            lines.append(f"   [{i}] Killmail ID: {killmail_id}")
             if victim:
                 victim_name = victim.get("character_name", "Unknown")
                 ship_name = victim.get("ship_name", "Unknown ship")
                 corp_name = victim.get("corporation_name", "Unknown")
-                logger.info(f"       Victim: {victim_name} ({ship_name})")
-                logger.info(f"       Corporation: {corp_name}")
+                lines.append(f"       Victim: {victim_name} ({ship_name})")
+                lines.append(f"       Corporation: {corp_name}")
             
             if attackers:
-                logger.info(f"       Attackers: {len(attackers)}")
+                lines.append(f"       Attackers: {len(attackers)}")
                 final_blow = next((a for a in attackers if a.get("final_blow")), None)
                 if final_blow:
                     attacker_name = final_blow.get("character_name", "Unknown")
                     attacker_ship = final_blow.get("ship_name", "Unknown ship")
-                    logger.info(f"       Final blow: {attacker_name} ({attacker_ship})")
+                    lines.append(f"       Final blow: {attacker_name} ({attacker_ship})")
             
             if zkb:
                 total_value = zkb.get("total_value", 0)
-                logger.info(f"       Value: {total_value / 1000000:.2f}M ISK")
+                lines.append(f"       Value: {total_value / 1000000:.2f}M ISK")
+        
+        logger.info("🔥 New killmails in system %s:\n%s", system_id, "\n".join(lines))
     
     def _handle_kill_count_update(self, payload: Dict[str, Any]):
         """Handle kill count update events."""
+        if not logger.isEnabledFor(logging.INFO):
+            return
         system_id = payload.get("system_id")
         count = payload.get("count")
-        logger.info(f"📊 Kill count update for system {system_id}: {count} kills")
+        logger.info("📊 Kill count update for system %s: %s kills", system_id, count)
     
     def _handle_preload_status(self, payload: Dict[str, Any]):
         """Handle preload status updates."""
@@ -306,77 +511,291 @@ class WandererKillsClient:
                 
                 if self.websocket and not self.websocket.closed:
                     self.heartbeat_ref += 1
-                    heartbeat_msg = {
-                        "topic": "phoenix",
-                        "event": "heartbeat",
-                        "payload": {},
-                        "ref": str(self.heartbeat_ref)
-                    }
-                    await self.websocket.send(json.dumps(heartbeat_msg))
+                    await self.websocket.send(f'{HEARTBEAT_FRAME_HEAD}"{self.heartbeat_ref}"}}')
                     logger.debug("💓 Heartbeat sent")
             except Exception as e:
                 logger.error(f"Error sending heartbeat: {e}")
     
     async def _listen_for_messages(self):
-        """Listen for incoming WebSocket messages."""
+        """Receive WebSocket frames and queue them for the dispatcher."""
+        inbox = self._inbox
         try:
             while self.running and self.websocket:
                 try:
                     message = await self.websocket.recv()
-                    data = json.loads(message)
-                    
-                    # Route message to appropriate channel
-                    topic = data.get("topic")
-                    if topic == "killmails:lobby" and self.channel:
-                        await self.channel.handle_message(data)
-                    elif topic == "phoenix" and data.get("event") == "phx_reply":
-                        # Heartbeat response, ignore
-                        pass
-                    else:
-                        logger.debug(f"Unhandled message: {data}")
-                        
                 except ConnectionClosed:
                     logger.warning("📡 WebSocket connection closed")
                     break
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to decode message: {e}")
-                except Exception as e:
-                    logger.error(f"Error handling message: {e}")
+                
+                try:
+                    inbox.put_nowait(message)
+                except asyncio.QueueFull:
+                    await self._queue_under_pressure(message)
+                else:
+                    # Later kill counts must not jump ahead of this frame
+                    self._kill_count_batch = None
                     
         except Exception as e:
             logger.error(f"Error in message listener: {e}")
         finally:
             self.running = False
+            self._stop_event.set()
+            # Stop the dispatcher once the queue drains, unless disconnect()
+            # has already cancelled it
+            if self._dispatch_task is not None and not self._dispatch_task.done():
+                try:
+                    inbox.put_nowait(None)
+                except asyncio.QueueFull:
+                    self._stop_dispatch_task = asyncio.create_task(inbox.put(None))
+    
+    async def _queue_under_pressure(self, message):
+        """Queue a frame while the dispatcher is behind, coalescing kill count updates."""
+        try:
+            data = json_loads(message)
+        except ValueError:
+            data = None
+        
+        if not isinstance(data, dict):
+            # Undecodable; the dispatcher reports it
+            self._kill_count_batch = None
+            await self._inbox.put(message)
+        elif data.get("event") == "kill_count_update":
+            batch = self._kill_count_batch
+            if batch is None:
+                batch = self._kill_count_batch = _KillCountBatch()
+                await self._inbox.put(batch)
+            system_id = (data.get("payload") or {}).get("system_id")
+            if system_id in batch:
+                self.coalesced_kill_count_updates += 1
+            batch[system_id] = data
+        else:
+            # Close the open batch so it keeps its place before this frame, and
+            # queue the decoded dict so the dispatcher does not parse it again
+            self._kill_count_batch = None
+            await self._inbox.put(data)
+    
+    async def _dispatch_messages(self):
+        """Decode queued frames and route them to the channel.
+
+        Runs as its own task so slow handlers never delay reading the socket.
+        """
+        while True:
+            message = await self._inbox.get()
+            if message is None:
+                break
+            
+            if isinstance(message, _KillCountBatch):
+                if self._kill_count_batch is message:
+                    self._kill_count_batch = None
+                for data in list(message.values()):
+                    try:
+                        await self._route_message(data)
+                    except Exception as e:
+                        logger.error(f"Error handling message: {e}")
+                continue
+            
+            data = None
+            try:
+                # Frames queued under pressure arrive already decoded
+                data = message if isinstance(message, dict) else self._decode(message)
+                await self._route_message(data)
+            except ValueError as e:
+                logger.error(f"Failed to decode message: {e}")
+            except Exception as e:
+                logger.error(f"Error handling message: {e}")
+            finally:
+                # The simdjson parser reuses its buffer for the next frame,
+                # so no proxies may survive past this iteration.
+                data = None
+    
+    async def _route_message(self, data):
+        """Route a decoded message to the appropriate channel."""
+        topic = data.get("topic")
+        if topic == "killmails:lobby" and self.channel:
+            await self.channel.handle_message(data)
+        elif topic == "phoenix" and data.get("event") == "phx_reply":
+            # Heartbeat response, ignore
+            pass
+        elif logger.isEnabledFor(logging.DEBUG):
+            # Lazy proxies would format as opaque parser objects
+            logger.debug("Unhandled message: %s", _materialize(data))
     
     async def subscribe_to_systems(self, system_ids: List[int]) -> Dict[str, Any]:
-        """Subscribe to specific EVE Online systems."""
+        """Subscribe to specific EVE Online systems.
+
+        Calls made in quick succession are sent to the server as one batch.
+        """
         if not self.channel or not self.channel.joined:
             raise Exception("Not connected to channel")
         
-        result = await self.channel.push("subscribe_systems", {"systems": system_ids})
-        
-        if result.get("status") == "ok":
-            response = result.get("response", {})
-            self.subscribed_systems.update(system_ids)
-            logger.info(f"✅ Subscribed to systems: {', '.join(map(str, system_ids))}")
-            logger.info(f"📡 Total system subscriptions: {len(response.get('subscribed_systems', []))}")
-            return response
-        else:
-            raise Exception(f"Failed to subscribe: {result}")
+        mask = _system_mask(system_ids)
+        if not mask:
+            return {}
+        self._pending_unsub_bits &= ~mask
+        self._pending_sub_bits |= mask
+        return await self._schedule_flush("subscribe_systems")
     
     async def unsubscribe_from_systems(self, system_ids: List[int]) -> Dict[str, Any]:
-        """Unsubscribe from specific EVE Online systems."""
+        """Unsubscribe from specific EVE Online systems.
+
+        Calls made in quick succession are sent to the server as one batch.
+        """
         if not self.channel or not self.channel.joined:
             raise Exception("Not connected to channel")
         
-        result = await self.channel.push("unsubscribe_systems", {"systems": system_ids})
+        mask = _system_mask(system_ids)
+        if not mask:
+            return {}
+        self._pending_sub_bits &= ~mask
+        self._pending_unsub_bits |= mask
+        return await self._schedule_flush("unsubscribe_systems")
+    
+    async def _schedule_flush(self, event: str) -> Dict[str, Any]:
+        """Wait for the server's reply to the batched push for this event."""
+        future = self._pending_futures.get(event)
+        if future is None:
+            future = self._pending_futures[event] = asyncio.get_running_loop().create_future()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_soon())
+        # Shielded so one cancelled caller does not cancel the result for the others
+        return await asyncio.shield(future)
+    
+    async def _flush_soon(self):
+        """Send all pending system subscription changes, once the burst settles."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + FLUSH_MAX_DELAY
+        depth = -1
+        try:
+            while depth != self._pending_depth() and loop.time() < deadline:
+                depth = self._pending_depth()
+                await asyncio.sleep(FLUSH_MIN_DELAY)
+        except asyncio.CancelledError:
+            # Nothing was taken from the pending set yet; hand it to a new
+            # flush unless the client is disconnecting
+            self._flush_task = None
+            if self.running:
+                self._flush_task = asyncio.create_task(self._flush_soon())
+            raise
+        
+        # Later calls start a new batch, which waits for this one to be sent
+        self._flush_task = None
+        batch = {
+            "subscribe_systems": self._pending_sub_bits,
+            "unsubscribe_systems": self._pending_unsub_bits,
+        }
+        self._pending_sub_bits = self._pending_unsub_bits = 0
+        futures, self._pending_futures = self._pending_futures, {}
+        
+        # Bits not yet sent; only these are requeued if the flush is cancelled.
+        # Each chunk is marked as sent just before its push goes out.
+        # Changes the server rejected are never requeued: the caller already
+        # got the error, and resending them would fail later, unrelated calls.
+        unsent = dict(batch)
+        # (response, error) per event whose push completed
+        outcomes: Dict[str, tuple] = {}
+        try:
+            async with self._flush_lock:
+                for event, bits in batch.items():
+                    if bits:
+                        outcomes[event] = await self._push_system_chunks(event, bits, unsent)
+        finally:
+            self._settle_batch(batch, unsent, outcomes, futures)
+    
+    async def _push_system_chunks(self, event: str, bits: int, unsent: Dict[str, int]) -> tuple:
+        """Push one direction of a batch in server-sized chunks; return (response, error)."""
+        system_ids = _system_ids(bits)
+        response: Dict[str, Any] = {}
+        error = None
+        for start in range(0, len(system_ids), MAX_SYSTEMS_PER_PUSH):
+            chunk = system_ids[start:start + MAX_SYSTEMS_PER_PUSH]
+            chunk_bits = _system_mask(chunk)
+            unsent[event] &= ~chunk_bits
+            try:
+                response = await self._push_systems(event, chunk)
+            except Exception as e:
+                error = error or e
+                continue
+            subscribed = len(response.get("subscribed_systems", []))
+            if event == "subscribe_systems":
+                self._system_bits |= chunk_bits
+                logger.info(f"✅ Subscribed to {len(chunk)} systems")
+                logger.info(f"📡 Total system subscriptions: {subscribed}")
+            else:
+                self._system_bits &= ~chunk_bits
+                logger.info(f"❌ Unsubscribed from {len(chunk)} systems")
+                logger.info(f"📡 Remaining system subscriptions: {subscribed}")
+        return response, error
+    
+    def _settle_batch(self, batch, unsent, outcomes, futures):
+        """Resolve a batch's callers, and requeue what a cancelled flush left unsent."""
+        for event, future in futures.items():
+            if future.done() or not batch[event]:
+                continue
+            if event in outcomes:
+                response, error = outcomes[event]
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(response)
+            elif not self.running:
+                future.cancel()  # Disconnected
+            elif unsent[event]:
+                self._carry_over(event, future)
+            else:
+                future.set_exception(Exception(f"Interrupted while waiting for {event} reply"))
+        
+        # Callers whose changes were all reversed later in the batch get the
+        # outcome of the opposite push, which reflects them
+        for event, future in futures.items():
+            if future.done() or batch[event]:
+                continue
+            opposite = futures.get(
+                "unsubscribe_systems" if event == "subscribe_systems" else "subscribe_systems"
+            )
+            if opposite is not None:
+                opposite.add_done_callback(lambda source, target=future: _copy_outcome(source, target))
+            elif self.running:
+                future.set_result({})
+            else:
+                future.cancel()
+        
+        if self.running:
+            for event, bits in unsent.items():
+                if bits:
+                    self._restore_pending(event, bits)
+            if (self._pending_depth() or self._pending_futures) and self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_soon())
+    
+    def _carry_over(self, event: str, future: asyncio.Future):
+        """Move a caller whose changes were requeued onto the next batch."""
+        pending = self._pending_futures.get(event)
+        if pending is None:
+            self._pending_futures[event] = future
+        else:
+            pending.add_done_callback(lambda source: _copy_outcome(source, future))
+    
+    def _restore_pending(self, event: str, bits: int):
+        """Requeue unsent system changes, except those a newer call has replaced."""
+        bits &= ~(self._pending_sub_bits | self._pending_unsub_bits)
+        if event == "subscribe_systems":
+            self._pending_sub_bits |= bits
+        else:
+            self._pending_unsub_bits |= bits
+    
+    def _pending_depth(self) -> int:
+        """Number of system subscription changes waiting to be sent."""
+        return self._pending_sub_bits.bit_count() + self._pending_unsub_bits.bit_count()
+    
+    async def _push_systems(self, event: str, system_ids: List[int]) -> Dict[str, Any]:
+        """Push one batched system subscription change and return the server response."""
+        result = await self.channel.push_encoded(
+            event, SYSTEMS_PAYLOAD_PREFIX, json_dumps(system_ids), "}"
+        )
         
         if result.get("status") == "ok":
-            response = result.get("response", {})
-            self.subscribed_systems.difference_update(system_ids)
-            logger.info(f"❌ Unsubscribed from systems: {', '.join(map(str, system_ids))}")
-            logger.info(f"📡 Remaining system subscriptions: {len(response.get('subscribed_systems', []))}")
-            return response
+            return result.get("response", {})
+        elif event == "subscribe_systems":
+            raise Exception(f"Failed to subscribe: {result}")
         else:
             raise Exception(f"Failed to unsubscribe: {result}")
     
@@ -429,13 +848,43 @@ class WandererKillsClient:
         else:
             raise Exception(f"Failed to get status: {result}")
     
+    async def wait_closed(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the connection closes or the timeout elapses.
+
+        Returns True if the connection closed, False on timeout.
+        """
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+    
     async def disconnect(self):
         """Disconnect from the WebSocket server."""
         self.running = False
+        self._stop_event.set()
         
-        # Cancel heartbeat
+        # Cancel heartbeat and any unsent subscription batch
         if self.heartbeat_task:
             self.heartbeat_task.cancel()
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        for future in self._pending_futures.values():
+            future.cancel()
+        self._pending_futures = {}
+        self._pending_sub_bits = self._pending_unsub_bits = 0
+        if self._dispatch_task:
+            self._dispatch_task.cancel()
+            self._dispatch_task = None
+        if self._stop_dispatch_task:
+            self._stop_dispatch_task.cancel()
+            self._stop_dispatch_task = None
+        # The listener may be waiting for queue room the cancelled dispatcher
+        # will never free
+        if self._listen_task:
+            self._listen_task.cancel()
+            self._listen_task = None
         
         if self.websocket:
             try:
@@ -465,9 +914,9 @@ async def basic_example():
         # Get current status
         await client.get_status()
         
-        # Keep running for 5 minutes
+        # Keep running for 5 minutes, or until the connection closes
         logger.info("🎧 Listening for killmail updates... Press Ctrl+C to stop")
-        await asyncio.sleep(5 * 60)
+        await client.wait_closed(timeout=5 * 60)
         
     except Exception as e:
         logger.error(f"❌ Client error: {e}")
@@ -495,8 +944,8 @@ async def preload_example():
         
         logger.info("🚀 Connected with extended preload configuration")
         
-        # Keep running for 10 minutes to see real-time kills after preload
-        await asyncio.sleep(10 * 60)
+        # Keep running for 10 minutes to see real-time kills after preload (or until the connection closes)
+        await client.wait_closed(timeout=10 * 60)
         
     except Exception as e:
         logger.error(f"❌ Client error: {e}")
@@ -543,8 +992,8 @@ async def advanced_example():
         # Get final status
         await client.get_status()
         
-        # Keep running for remaining time
-        await asyncio.sleep(4 * 60)
+        # Keep running for remaining time, or until the connection closes
+        await client.wait_closed(timeout=4 * 60)
         
     except Exception as e:
         logger.error(f"❌ Client error: {e}")
@@ -561,9 +1010,14 @@ async def main():
         logger.info("🛑 Shutdown signal received")
         stop_event.set()
     
-    # Handle SIGINT (Ctrl+C) and SIGTERM
+    # Handle SIGINT (Ctrl+C) and SIGTERM inside the event loop
+    loop = asyncio.get_running_loop()
     for sig in [signal.SIGINT, signal.SIGTERM]:
-        signal.signal(sig, lambda s, f: signal_handler())
+        try:
+            loop.add_signal_handler(sig, signal_handler)
+        except NotImplementedError:
+            # Windows event loops have no add_signal_handler
+            signal.signal(sig, lambda s, f: loop.call_soon_threadsafe(signal_handler))
     
     # Check command line arguments
     example_type = sys.argv[1] if len(sys.argv) > 1 else "basic"
@@ -597,9 +1051,18 @@ async def main():
     logger.info("👋 Goodbye!")
 
 
+def run(coro):
+    """Run the coroutine on uvloop when it is installed, else on the default asyncio loop."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
+
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run(main())
     except KeyboardInterrupt:
         pass  # Handled by signal handler
     except Exception as e: